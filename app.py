@@ -3,21 +3,135 @@
 Flask Web Application for Hybrid AI Travel Assistant
 Professional web interface with REST API endpoints
 """
-from flask import Flask, render_template, request, jsonify, session
+from flask import Flask, render_template, request, jsonify, session, Response, stream_with_context
 import json
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import uuid
 
 # Import our hybrid chat functionality
-from hybrid_chat import get_vector_context, get_graph_context, build_prompt, deepseek_chat
+from hybrid_chat import get_vector_context, get_graph_context, build_prompt, deepseek_chat, deepseek_chat_stream
 import config
 
 app = Flask(__name__)
 app.secret_key = os.urandom(24)  # For session management
 
-# Store conversations in memory (in production, use a database)
-conversations = {}
+# Use orjson (Rust, SIMD-accelerated) for request/response JSON when
+# installed - 2-5x faster than the stdlib module on Pinecone-sized payloads
+try:
+    import orjson
+    from flask.json.provider import JSONProvider
+
+    class OrjsonProvider(JSONProvider):
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj).decode()
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+    app.json = OrjsonProvider(app)
+except ImportError:
+    pass  # stdlib json works fine, just slower
+
+# Compress JSON responses (brotli preferred, gzip fallback) when
+# flask-compress is installed - roughly 70% fewer bytes on text payloads
+try:
+    from flask_compress import Compress
+    app.config["COMPRESS_ALGORITHM"] = ["br", "gzip"]
+    app.config["COMPRESS_MIN_SIZE"] = 512
+    app.config["COMPRESS_LEVEL"] = 4
+    app.config["COMPRESS_BR_LEVEL"] = 4
+    Compress(app)
+except ImportError:
+    pass  # responses simply go uncompressed
+
+# Shared pool to overlap the independent Pinecone and Neo4j lookups,
+# turning t_pinecone + t_neo4j into max(t_pinecone, t_neo4j) per request.
+search_pool = ThreadPoolExecutor(max_workers=8)
+
+# Keep at most this many messages per conversation (sliding window) so a
+# single long-running session can't grow without bound
+MAX_SESSION_MESSAGES = 50
+
+# In-memory fallback store: TTL + LRU eviction when cachetools is available,
+# plain dict otherwise
+try:
+    from cachetools import TTLCache
+
+    def _memory_store():
+        return TTLCache(maxsize=10_000, ttl=config.CONVERSATION_TTL)
+except ImportError:
+    def _memory_store():
+        return {}
+
+# Conversation storage: Redis when available (shared across gunicorn workers,
+# TTL-based eviction), otherwise fall back to an in-process store.
+class ConversationStore:
+    """Per-session conversation history backed by Redis with a dict fallback."""
+
+    def __init__(self):
+        self._redis = None
+        self._memory = _memory_store()
+        self._lock = threading.RLock()
+        try:
+            import redis
+            client = redis.from_url(config.REDIS_URL, decode_responses=True)
+            client.ping()
+            self._redis = client
+            print("✅ Redis connected for session storage")
+        except Exception as e:
+            print(f"⚠️  Redis not available: {e}")
+            print("   Using in-memory session storage (single worker only)...")
+
+    def _key(self, session_id):
+        return f"conv:{session_id}"
+
+    def append(self, session_id, message):
+        if self._redis:
+            key = self._key(session_id)
+            self._redis.rpush(key, json.dumps(message))
+            self._redis.ltrim(key, -MAX_SESSION_MESSAGES, -1)
+            self._redis.expire(key, config.CONVERSATION_TTL)
+        else:
+            with self._lock:
+                history = self._memory.setdefault(session_id, [])
+                history.append(message)
+                if len(history) > MAX_SESSION_MESSAGES:
+                    del history[:-MAX_SESSION_MESSAGES]
+                # Re-assign so a TTLCache entry's expiry resets on every
+                # append - the TTL slides with activity like the Redis
+                # expire() above, instead of counting from the first message
+                self._memory[session_id] = history
+
+    def get(self, session_id):
+        if self._redis:
+            return [json.loads(m) for m in self._redis.lrange(self._key(session_id), 0, -1)]
+        with self._lock:
+            return list(self._memory.get(session_id, []))
+
+    def clear(self, session_id):
+        if self._redis:
+            self._redis.delete(self._key(session_id))
+        else:
+            with self._lock:
+                self._memory.pop(session_id, None)
+
+    def stats(self):
+        """Return (total sessions, total messages) without loading every conversation."""
+        if self._redis:
+            sessions = messages = 0
+            for key in self._redis.scan_iter(match="conv:*", count=100):
+                sessions += 1
+                messages += self._redis.llen(key)
+            return sessions, messages
+        with self._lock:
+            sessions = len(self._memory)
+            messages = sum(len(conv) for conv in self._memory.values())
+        return sessions, messages
+
+conversations = ConversationStore()
 
 @app.route('/')
 def index():
@@ -75,28 +189,28 @@ def chat():
         if not session_id:
             session_id = str(uuid.uuid4())
             session['session_id'] = session_id
-            conversations[session_id] = []
-        
+
         # Add user message to conversation
-        conversations[session_id].append({
+        conversations.append(session_id, {
             "type": "user",
             "message": user_message,
             "timestamp": datetime.now().isoformat()
         })
         
-        # Get context from vector search
+        # Fire vector and graph searches concurrently - both block on
+        # network I/O, so there is no reason to run them back to back.
         print(f"🔍 Processing query: {user_message}")
-        vector_matches = get_vector_context(user_message, top_k=5)
-        
-        # Get context from graph search
-        graph_facts = get_graph_context(user_message)
+        vector_future = search_pool.submit(get_vector_context, user_message, 5)
+        graph_future = search_pool.submit(get_graph_context, user_message)
+        vector_matches = vector_future.result()
+        graph_facts = graph_future.result()
         
         # Build prompt and get AI response
         prompt = build_prompt(user_message, vector_matches, graph_facts)
-        ai_response = deepseek_chat(prompt)
+        ai_response = deepseek_chat(prompt, fallback_ctx=(user_message, vector_matches, graph_facts))
         
         # Add assistant response to conversation
-        conversations[session_id].append({
+        conversations.append(session_id, {
             "type": "assistant",
             "message": ai_response,
             "sources": {
@@ -122,20 +236,77 @@ def chat():
             "details": str(e) if app.debug else None
         }), 500
 
+@app.route('/api/chat/stream', methods=['POST'])
+def chat_stream():
+    """Stream the AI response token-by-token over Server-Sent Events."""
+    try:
+        data = request.get_json()
+        user_message = data.get('message', '').strip()
+
+        if not user_message:
+            return jsonify({"error": "Message cannot be empty"}), 400
+
+        session_id = session.get('session_id')
+        if not session_id:
+            session_id = str(uuid.uuid4())
+            session['session_id'] = session_id
+
+        conversations.append(session_id, {
+            "type": "user",
+            "message": user_message,
+            "timestamp": datetime.now().isoformat()
+        })
+
+        print(f"🔍 Processing query (stream): {user_message}")
+        vector_future = search_pool.submit(get_vector_context, user_message, 5)
+        graph_future = search_pool.submit(get_graph_context, user_message)
+        vector_matches = vector_future.result()
+        graph_facts = graph_future.result()
+
+        prompt = build_prompt(user_message, vector_matches, graph_facts)
+        sources = {
+            "vector_results": len(vector_matches),
+            "graph_results": len(graph_facts)
+        }
+    except Exception as e:
+        print(f"❌ Chat error: {e}")
+        return jsonify({
+            "error": "I'm having trouble processing your request. Please try again.",
+            "details": str(e) if app.debug else None
+        }), 500
+
+    def generate():
+        chunks = []
+        fallback_ctx = (user_message, vector_matches, graph_facts)
+        for chunk in deepseek_chat_stream(prompt, fallback_ctx=fallback_ctx):
+            chunks.append(chunk)
+            yield f"data: {json.dumps({'delta': chunk})}\n\n"
+
+        # Persist the full message once streaming is done
+        conversations.append(session_id, {
+            "type": "assistant",
+            "message": ''.join(chunks),
+            "sources": sources,
+            "timestamp": datetime.now().isoformat()
+        })
+        yield f"data: {json.dumps({'done': True, 'sources': sources})}\n\n"
+
+    return Response(stream_with_context(generate()), mimetype="text/event-stream")
+
 @app.route('/api/conversation')
 def get_conversation():
     """Get conversation history for the current session."""
     session_id = session.get('session_id')
-    if session_id and session_id in conversations:
-        return jsonify(conversations[session_id])
+    if session_id:
+        return jsonify(conversations.get(session_id))
     return jsonify([])
 
 @app.route('/api/clear', methods=['POST'])
 def clear_conversation():
     """Clear the current conversation."""
     session_id = session.get('session_id')
-    if session_id and session_id in conversations:
-        del conversations[session_id]
+    if session_id:
+        conversations.clear(session_id)
     session.pop('session_id', None)
     return jsonify({"status": "cleared"})
 
@@ -143,13 +314,12 @@ def clear_conversation():
 def get_stats():
     """Get system statistics."""
     try:
-        total_conversations = len(conversations)
-        total_messages = sum(len(conv) for conv in conversations.values())
-        
+        total_conversations, total_messages = conversations.stats()
+
         return jsonify({
             "total_conversations": total_conversations,
             "total_messages": total_messages,
-            "active_sessions": len([s for s in conversations.keys()]),
+            "active_sessions": total_conversations,
             "system_status": "operational"
         })
         
@@ -2,49 +2,64 @@
 """
 Check the Vietnam travel dataset for specific content
 """
-import json
+from collections import Counter
+
+from dataset_utils import iter_dataset
+
+DATA_FILE = 'vietnam_travel_dataset.json'
 
 def check_dataset():
-    with open('vietnam_travel_dataset.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    print(f"Total items in dataset: {len(data)}")
-    
-    # Check for zoos
-    zoo_items = [item for item in data if 
-                 'zoo' in item.get('name', '').lower() or 
-                 'zoo' in item.get('description', '').lower() or
-                 any('zoo' in str(tag).lower() for tag in item.get('tags', []))]
-    
-    print(f"\nZoo-related items: {len(zoo_items)}")
-    for item in zoo_items[:5]:
+    total = 0
+    types = Counter()
+    zoo_count = 0
+    zoo_items = []    # keep only the first few matches
+    hanoi_count = 0
+    hanoi_items = []
+    samples = []
+
+    # Single streaming pass: each text field is casefolded exactly once and
+    # reused for every keyword check, instead of re-lowercasing per check
+    for item in iter_dataset(DATA_FILE):
+        total += 1
+        types[item.get('type', 'Unknown')] += 1
+
+        name_l = item.get('name', '').casefold()
+        desc_l = item.get('description', '').casefold()
+        city_l = item.get('city', '').casefold()
+        tags_l = [str(tag).casefold() for tag in item.get('tags', [])]
+
+        if 'zoo' in name_l or 'zoo' in desc_l or any('zoo' in tag for tag in tags_l):
+            zoo_count += 1
+            if len(zoo_items) < 5:
+                zoo_items.append(item)
+
+        if 'hanoi' in name_l or 'hanoi' in city_l or 'hanoi' in desc_l:
+            hanoi_count += 1
+            if len(hanoi_items) < 10:
+                hanoi_items.append(item)
+
+        if len(samples) < 3:
+            samples.append(item)
+
+    print(f"Total items in dataset: {total}")
+
+    print(f"\nZoo-related items: {zoo_count}")
+    for item in zoo_items:
         print(f"- {item['name']} ({item.get('type', 'Unknown')})")
         if item.get('description'):
             print(f"  Description: {item['description'][:100]}...")
-    
-    # Check types
-    types = {}
-    for item in data:
-        item_type = item.get('type', 'Unknown')
-        types[item_type] = types.get(item_type, 0) + 1
-    
+
     print(f"\nItem types:")
     for item_type, count in sorted(types.items()):
         print(f"- {item_type}: {count}")
-    
-    # Check for Hanoi items
-    hanoi_items = [item for item in data if 
-                   'hanoi' in item.get('name', '').lower() or 
-                   'hanoi' in item.get('city', '').lower() or
-                   'hanoi' in item.get('description', '').lower()]
-    
-    print(f"\nHanoi-related items: {len(hanoi_items)}")
-    for item in hanoi_items[:10]:
+
+    print(f"\nHanoi-related items: {hanoi_count}")
+    for item in hanoi_items:
         print(f"- {item['name']} ({item.get('type', 'Unknown')}) - {item.get('city', '')}")
-    
+
     # Sample a few items
     print(f"\nSample items:")
-    for i, item in enumerate(data[:3]):
+    for i, item in enumerate(samples):
         print(f"{i+1}. {item['name']} ({item.get('type', 'Unknown')})")
         print(f"   City: {item.get('city', item.get('region', 'N/A'))}")
         print(f"   Tags: {item.get('tags', [])}")
@@ -53,4 +68,4 @@ def check_dataset():
         print()
 
 if __name__ == "__main__":
-    check_dataset()
\ No newline at end of file
+    check_dataset()
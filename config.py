@@ -20,8 +20,13 @@ NEO4J_USER = os.getenv('NEO4J_USER', "neo4j")
 NEO4J_PASSWORD = os.getenv('NEO4J_PASSWORD', "")  # Empty password
 USE_NEO4J = True  # Set to False if you don't want to use Neo4j
 
+# Redis Configuration (optional, for shared session storage across workers)
+REDIS_URL = os.getenv('REDIS_URL', "redis://localhost:6379/0")
+CONVERSATION_TTL = 3600  # Seconds before an idle conversation expires
+
 # For embedding generation (using sentence-transformers - completely local)
 EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+USE_EMBEDDING_WORKER = False  # Set to True to run embedding in a separate process
 
 # Local fallback storage (if Pinecone fails)
 LOCAL_VECTOR_FILE = "local_vectors.json"
\ No newline at end of file
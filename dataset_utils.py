@@ -0,0 +1,20 @@
+# dataset_utils.py
+"""Shared helpers for reading the travel dataset."""
+import json
+
+def iter_dataset(path):
+    """Yield dataset items one at a time; streams with ijson when available
+    so the whole JSON array never has to sit in memory at once."""
+    try:
+        import ijson
+    except ImportError:
+        with open(path, "rb") as f:
+            data = f.read()
+        try:
+            import orjson
+            yield from orjson.loads(data)
+        except ImportError:
+            yield from json.loads(data)
+        return
+    with open(path, "rb") as f:
+        yield from ijson.items(f, "item")
@@ -0,0 +1,101 @@
+# embedding_worker.py
+"""
+Dedicated embedding worker process.
+
+Keeps the embedding model in its own process so Torch operator execution
+doesn't contend with Flask request threads for the GIL, and so the model
+is loaded exactly once regardless of how the server process is threaded.
+Enable via USE_EMBEDDING_WORKER in config.py; hybrid_chat falls back to
+in-process embedding when the worker can't start.
+"""
+import multiprocessing as mp
+import threading
+
+def _worker_loop(request_queue, response_queue, model_name):
+    """Runs in the child process: load the model once, then serve batches."""
+    from sentence_transformers import SentenceTransformer
+    model = SentenceTransformer(model_name)
+
+    # Warm up here rather than in the parent: the first-call JIT and
+    # kernel-selection cost lands in this process, before any request.
+    try:
+        model.encode(["warmup"] * 4, batch_size=4)
+    except Exception:
+        pass
+
+    while True:
+        item = request_queue.get()
+        if item is None:  # shutdown sentinel
+            break
+        req_id, texts = item
+        try:
+            embeddings = model.encode(texts, batch_size=32)
+            response_queue.put((req_id, embeddings.tolist(), None))
+        except Exception as e:
+            response_queue.put((req_id, None, str(e)))
+
+class EmbeddingWorker:
+    """model.encode-compatible proxy that forwards batches to the worker.
+
+    encode is safe for concurrent callers (hybrid_chat's batcher thread and
+    direct batch calls share one proxy): a lock serializes each
+    request/reply round-trip, so every caller always reads its own reply.
+    """
+
+    def __init__(self, model_name):
+        import numpy as np
+
+        self._np = np
+        self._model_name = model_name
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._requests = None
+        self._responses = None
+        self._process = None
+
+    def _ensure_started(self):
+        """Spawn the child on the first encode.
+
+        Spawning during module import would make the child's bootstrap
+        re-run the importing module's top level (app.py/hybrid_chat.py),
+        re-connecting to Pinecone/Neo4j and trying to start a worker of
+        its own. hybrid_chat's warmup skips this proxy, so the first
+        encode - and the spawn - happens on the first real request.
+        """
+        if self._process is None:
+            ctx = mp.get_context("spawn")
+            self._requests = ctx.Queue()
+            self._responses = ctx.Queue()
+            self._process = ctx.Process(
+                target=_worker_loop,
+                args=(self._requests, self._responses, self._model_name),
+                daemon=True
+            )
+            self._process.start()
+        if not self._process.is_alive():
+            raise RuntimeError("embedding worker process died")
+
+    def encode(self, texts, batch_size=32, **kwargs):
+        with self._lock:
+            self._ensure_started()
+            self._next_id += 1
+            req_id = self._next_id
+            self._requests.put((req_id, list(texts)))
+
+            while True:
+                rid, result, error = self._responses.get()
+                if rid == req_id:
+                    break
+                # only possible after a restart left a stale reply behind;
+                # with the round-trip locked it can't belong to a live caller
+
+        if error:
+            raise RuntimeError(error)
+        return self._np.asarray(result, dtype="float32")
+
+    def close(self):
+        with self._lock:
+            if self._process is None:
+                return
+            self._requests.put(None)
+            self._process.join(timeout=5)
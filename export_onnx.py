@@ -0,0 +1,32 @@
+# export_onnx.py
+"""
+Export the embedding model to int8 ONNX for faster CPU inference.
+
+Run once, then hybrid_chat.py will pick up the quantized model from
+onnx_mini/ automatically (falls back to SentenceTransformer if absent).
+"""
+from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+from optimum.onnxruntime.configuration import AutoQuantizationConfig
+from transformers import AutoTokenizer
+import config
+
+OUTPUT_DIR = "onnx_mini"
+
+def main():
+    model_id = f"sentence-transformers/{config.EMBEDDING_MODEL}"
+
+    print(f"Exporting {model_id} to ONNX...")
+    model = ORTModelForFeatureExtraction.from_pretrained(model_id, export=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_id)
+    model.save_pretrained(OUTPUT_DIR)
+    tokenizer.save_pretrained(OUTPUT_DIR)
+
+    print("Applying int8 dynamic quantization...")
+    quantizer = ORTQuantizer.from_pretrained(OUTPUT_DIR)
+    qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False)
+    quantizer.quantize(save_dir=OUTPUT_DIR, quantization_config=qconfig)
+
+    print(f"✅ Quantized model saved to {OUTPUT_DIR}/")
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,20 @@
 import json
 import requests
 import os
+import queue
+import string
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from typing import List
+
+# Thread/env tuning must be in place before torch is pulled in transitively
+# by sentence_transformers below
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+os.environ.setdefault("OMP_NUM_THREADS", str(max(1, (os.cpu_count() or 2) // 2)))
+
+from requests.adapters import HTTPAdapter, Retry
 from sentence_transformers import SentenceTransformer
 from pinecone import Pinecone, ServerlessSpec
 from neo4j import GraphDatabase
@@ -13,11 +26,94 @@ import config
 # -----------------------------
 TOP_K = 5
 INDEX_NAME = config.PINECONE_INDEX_NAME
+ONNX_MODEL_DIR = "onnx_mini"  # created by export_onnx.py
 
 # -----------------------------
 # Initialize clients
 # -----------------------------
-model = SentenceTransformer(config.EMBEDDING_MODEL)
+class OnnxEmbedder:
+    """int8 ONNX Runtime embedder, a drop-in for SentenceTransformer.encode.
+
+    Tokenizes, runs the quantized ONNX graph, then mean-pools and
+    L2-normalizes in numpy — same output as model.encode but 2-4x faster
+    on CPU thanks to int8 weights.
+    """
+
+    def __init__(self, model_dir):
+        import numpy as np
+        import onnxruntime as ort
+        from optimum.onnxruntime import ORTModelForFeatureExtraction
+        from transformers import AutoTokenizer
+
+        so = ort.SessionOptions()
+        so.intra_op_num_threads = max(1, (os.cpu_count() or 2) // 2)
+
+        self._np = np
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.model = ORTModelForFeatureExtraction.from_pretrained(
+            model_dir, provider="CPUExecutionProvider", session_options=so
+        )
+
+    def encode(self, texts, batch_size=32, **kwargs):
+        np = self._np
+        pooled_batches = []
+        for i in range(0, len(texts), batch_size):
+            chunk = texts[i:i + batch_size]
+            enc = self.tokenizer(chunk, padding=True, truncation=True, return_tensors="np")
+            hidden = self.model(**enc).last_hidden_state
+            mask = enc["attention_mask"][..., None].astype(hidden.dtype)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            pooled /= np.linalg.norm(pooled, axis=1, keepdims=True)
+            pooled_batches.append(pooled)
+        return np.concatenate(pooled_batches)
+
+def _load_embedding_model():
+    """Pick the embedding backend: worker process, ONNX export, or in-process
+    SentenceTransformer, in that order of preference."""
+    if config.USE_EMBEDDING_WORKER:
+        try:
+            from embedding_worker import EmbeddingWorker
+            worker = EmbeddingWorker(config.EMBEDDING_MODEL)
+            print("✅ Embedding worker process started")
+            return worker
+        except Exception as e:
+            print(f"⚠️  Embedding worker unavailable: {e}")
+            print("   Falling back to in-process embedding...")
+    if os.path.isdir(ONNX_MODEL_DIR):
+        try:
+            embedder = OnnxEmbedder(ONNX_MODEL_DIR)
+            print("✅ Using int8 ONNX embedding model")
+            return embedder
+        except Exception as e:
+            print(f"⚠️  ONNX embedder unavailable: {e}")
+            print("   Falling back to SentenceTransformer...")
+    return SentenceTransformer(config.EMBEDDING_MODEL)
+
+def _warmup_model(model):
+    """Pin torch thread counts and pay the first-call JIT/kernel-selection
+    cost at startup so it doesn't land on the first user query."""
+    try:
+        from embedding_worker import EmbeddingWorker
+        if isinstance(model, EmbeddingWorker):
+            # Encoding here would spawn the child during module import
+            # (whose bootstrap re-runs this module's top level); the worker
+            # warms its own model up in _worker_loop instead.
+            return
+    except ImportError:
+        pass
+    try:
+        import torch
+        torch.set_num_threads(max(1, (os.cpu_count() or 2) // 2))
+        torch.set_num_interop_threads(1)
+    except Exception:
+        pass  # ONNX path, or torch already started parallel work
+    try:
+        model.encode(["warmup"] * 4, batch_size=4)
+    except Exception as e:
+        print(f"⚠️  Model warmup failed: {e}")
+
+model = _load_embedding_model()
+_warmup_model(model)
 
 # Check API keys
 if not config.PINECONE_API_KEY:
@@ -42,6 +138,55 @@ if INDEX_NAME not in pc.list_indexes().names():
 
 index = pc.Index(INDEX_NAME)
 
+# Optional local ANN fallback: if LOCAL_VECTOR_FILE exists, build an HNSW
+# index over it at startup so vector search keeps working when Pinecone is
+# unreachable - log-scale graph traversal instead of a linear scan.
+class LocalVectorIndex:
+    """hnswlib-backed ANN index over the local vector file.
+
+    Reads the copy pinecone_upload.py persists alongside its upsert:
+    [{"id": ..., "values": [...], "metadata": {...}}, ...].
+    """
+
+    def __init__(self, path):
+        import hnswlib
+        import numpy as np
+
+        with open(path, "r", encoding="utf-8") as f:
+            vectors = json.load(f)
+
+        self._np = np
+        self._ids = [v["id"] for v in vectors]
+        self._metadata = [v.get("metadata", {}) for v in vectors]
+        data = np.asarray([v["values"] for v in vectors], dtype="float32")
+
+        self._index = hnswlib.Index(space='cosine', dim=config.PINECONE_VECTOR_DIM)
+        self._index.init_index(max_elements=len(vectors), ef_construction=200, M=16)
+        self._index.add_items(data, list(range(len(vectors))), num_threads=os.cpu_count() or 1)
+        self._index.set_ef(64)
+
+    def query(self, vec, top_k):
+        """Return matches shaped like Pinecone's (id/score/metadata dicts)."""
+        query = self._np.asarray([vec], dtype="float32")
+        labels, distances = self._index.knn_query(query, k=min(top_k, len(self._ids)))
+        return [
+            {"id": self._ids[label], "score": 1.0 - float(dist), "metadata": self._metadata[label]}
+            for label, dist in zip(labels[0], distances[0])
+        ]
+
+def _load_local_index():
+    if not os.path.exists(config.LOCAL_VECTOR_FILE):
+        return None
+    try:
+        local = LocalVectorIndex(config.LOCAL_VECTOR_FILE)
+        print(f"✅ Local HNSW fallback index loaded from {config.LOCAL_VECTOR_FILE}")
+        return local
+    except Exception as e:
+        print(f"⚠️  Local vector index unavailable: {e}")
+        return None
+
+local_index = _load_local_index()
+
 # Connect to Neo4j (with optional password)
 try:
     if config.NEO4J_PASSWORD:
@@ -66,8 +211,30 @@ except Exception as e:
 # -----------------------------
 # DeepSeek API Integration
 # -----------------------------
-def deepseek_chat(prompt):
-    """Call DeepSeek Chat API with fallback."""
+# Pooled session with keep-alive: reusing the TLS connection to
+# openrouter.ai saves a TCP+TLS handshake (~150-300ms) on every call
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504])
+))
+def _extract_user_query(prompt):
+    """Best-effort recovery of the user question from an already-built prompt."""
+    if isinstance(prompt, list) and len(prompt) > 1:
+        for line in prompt[1]["content"].split('\n'):
+            if line.startswith("USER QUESTION:"):
+                return line.replace("USER QUESTION:", "").strip()
+        return ""
+    return str(prompt)
+
+def deepseek_chat(prompt, *, fallback_ctx=None):
+    """Call DeepSeek Chat API with fallback.
+
+    fallback_ctx is an optional (user_query, vector_matches, graph_facts)
+    tuple; when provided, the fallback generator works straight from the
+    structured search results instead of re-parsing the prompt text.
+    """
     url = 'https://openrouter.ai/api/v1/chat/completions'
     headers = {
         "Authorization": f"Bearer {config.DEEPSEEK_API_KEY}",
@@ -79,90 +246,93 @@ def deepseek_chat(prompt):
         "max_tokens": 600,
         "temperature": 0.7
     }
-    
+
     try:
-        response = requests.post(url, headers=headers, json=payload)
+        response = _session.post(url, headers=headers, json=payload, timeout=(3, 30))
         response.raise_for_status()
         return response.json()["choices"][0]["message"]["content"]
     except Exception as e:
         print(f"⚠️  DeepSeek API error: {str(e)}")
         print("   Using fallback response generation...")
-        return generate_fallback_response(prompt)
+        if fallback_ctx is not None:
+            return generate_fallback_response(*fallback_ctx)
+        return generate_fallback_response(_extract_user_query(prompt))
 
-def generate_fallback_response(prompt):
-    """Generate an intelligent fallback response using vector search data when DeepSeek API is unavailable."""
-    if isinstance(prompt, list) and len(prompt) > 1:
-        user_content = prompt[1]["content"]
-        # Extract the original query from the prompt
-        lines = user_content.split('\n')
-        user_query = ""
-        for line in lines:
-            if line.startswith("USER QUESTION:"):
-                user_query = line.replace("USER QUESTION:", "").strip()
-                break
-        
-        # Extract search results from the prompt
-        search_results = []
-        in_detailed_section = False
-        for line in lines:
-            if "=== DETAILED INFORMATION ===" in line:
-                in_detailed_section = True
+def deepseek_chat_stream(prompt, *, fallback_ctx=None):
+    """Stream DeepSeek chat tokens as they are generated.
+
+    Yields content chunks as soon as they arrive instead of waiting for the
+    full completion, so callers can show the first token in ~1-2s. On API
+    failure, yields the fallback response as a single chunk.
+    """
+    url = 'https://openrouter.ai/api/v1/chat/completions'
+    headers = {
+        "Authorization": f"Bearer {config.DEEPSEEK_API_KEY}",
+        "Content-Type": "application/json"
+    }
+    payload = {
+        "model": "alibaba/tongyi-deepresearch-30b-a3b:free",
+        "messages": prompt if isinstance(prompt, list) else [{"role": "user", "content": prompt}],
+        "max_tokens": 600,
+        "temperature": 0.7,
+        "stream": True
+    }
+
+    try:
+        response = _session.post(url, headers=headers, json=payload, stream=True, timeout=(3, 30))
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if not line:
                 continue
-            elif "=== SUMMARY ===" in line:
-                in_detailed_section = False
+            line = line.decode("utf-8")
+            if not line.startswith("data: "):
                 continue
-            elif in_detailed_section and line.strip() and not line.startswith("="):
-                search_results.append(line.strip())
-    else:
-        user_query = str(prompt)
-        search_results = []
-    
+            data = line[len("data: "):]
+            if data == "[DONE]":
+                break
+            try:
+                chunk = json.loads(data)
+                delta = chunk["choices"][0]["delta"].get("content")
+            except (KeyError, IndexError, json.JSONDecodeError):
+                continue
+            if delta:
+                yield delta
+    except Exception as e:
+        print(f"⚠️  DeepSeek streaming error: {str(e)}")
+        print("   Using fallback response generation...")
+        if fallback_ctx is not None:
+            yield generate_fallback_response(*fallback_ctx)
+        else:
+            yield generate_fallback_response(_extract_user_query(prompt))
+
+def generate_fallback_response(user_query, vector_matches=None, graph_facts=None):
+    """Generate an intelligent fallback response from structured search results
+    when the DeepSeek API is unavailable."""
+    vector_matches = vector_matches or []
+
     # If we have search results, use them to create a response
-    if search_results and len([r for r in search_results if r and not r.startswith("No")]) > 0:
+    if vector_matches:
         response = f"🇻🇳 **Vietnam Travel Recommendations for: {user_query}**\n\n"
-        
-        # Process the search results to extract detailed information
-        places_found = []
+
+        # Group matches by place type straight from their metadata - no
+        # re-parsing of formatted prompt text needed
         locations_by_type = {}
-        
-        for result in search_results[:8]:  # Process more results
-            if result and not result.startswith("No") and "." in result:
-                lines = result.split('\n')
-                name = ""
-                place_type = ""
-                location = ""
-                tags = []
-                description = ""
-                
-                for line in lines:
-                    line = line.strip()
-                    if line and "." in line and "(" in line and ")" in line:
-                        # Extract name and type
-                        parts = line.split("(")
-                        if len(parts) >= 2:
-                            name = parts[0].strip().split(".")[-1].strip()
-                            place_type = parts[1].split(")")[0] if ")" in parts[1] else "Location"
-                    elif line.startswith("Location:"):
-                        location = line.replace("Location:", "").strip()
-                    elif line.startswith("Tags:"):
-                        tags_str = line.replace("Tags:", "").strip()
-                        if tags_str and tags_str != "N/A":
-                            tags = [t.strip().strip("'\"[]") for t in tags_str.split(",")]
-                    elif line.startswith("Description:"):
-                        description = line.replace("Description:", "").strip()
-                
-                if name and place_type:
-                    if place_type not in locations_by_type:
-                        locations_by_type[place_type] = []
-                    
-                    entry = {
-                        "name": name,
-                        "location": location,
-                        "tags": tags,
-                        "description": description[:150] + "..." if len(description) > 150 else description
-                    }
-                    locations_by_type[place_type].append(entry)
-        
+
+        for match in vector_matches[:8]:  # Process more results
+            meta = match["metadata"]
+            name = meta.get('name', '')
+            place_type = meta.get('type', '')
+            if not name or not place_type:
+                continue
+
+            description = meta.get('description', '') or meta.get('text', '')
+            locations_by_type.setdefault(place_type, []).append({
+                "name": name,
+                "location": meta.get('city', meta.get('region', '')),
+                "tags": list(meta.get('tags', [])),
+                "description": description[:150] + "..." if len(description) > 150 else description
+            })
+
         # Format the response by type
         if locations_by_type:
             for place_type, places in locations_by_type.items():
@@ -293,63 +463,202 @@ For specific recommendations about {user_query}, please provide more details abo
 # -----------------------------
 # Helper functions
 # -----------------------------
+# Cache size for repeated queries (embedding + search results)
+CACHE_SIZE = 2048
+
+# Micro-batching: coalesce concurrent embed requests into one model.encode call
+MAX_EMBED_BATCH = 32
+EMBED_BATCH_WINDOW = 0.05  # seconds to wait for more requests to arrive
+
+class EmbeddingBatcher:
+    """Coalesce concurrent embedding requests into batched model.encode calls.
+
+    Each caller submits its text and blocks on a Future; a background worker
+    drains the queue (up to MAX_EMBED_BATCH items or EMBED_BATCH_WINDOW
+    seconds, whichever comes first) and runs a single batched forward pass,
+    so the transformer amortizes its work across concurrent requests instead
+    of running batch-size-1 forwards.
+    """
+
+    def __init__(self, model, max_batch=MAX_EMBED_BATCH, window=EMBED_BATCH_WINDOW):
+        self.model = model
+        self.max_batch = max_batch
+        self.window = window
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def submit(self, text: str) -> Future:
+        """Queue a text for embedding; returns a Future resolving to a list[float]."""
+        future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def _run(self):
+        while True:
+            # Block for the first item, then gather more until the batch is
+            # full or the batching window closes.
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            texts = [text for text, _ in batch]
+            try:
+                embeddings = self.model.encode(texts, batch_size=self.max_batch)
+                for (_, future), embedding in zip(batch, embeddings):
+                    future.set_result(embedding.tolist())
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+
+batcher = EmbeddingBatcher(model)
+
+def _normalize_query(text: str) -> str:
+    """Normalize query text so trivially different queries share cache entries."""
+    return text.strip().lower()
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _embed_cached(text_key: str):
+    """Embed a normalized query and return a hashable tuple for caching."""
+    return tuple(batcher.submit(text_key).result())
+
 def embed_text(text: str) -> List[float]:
     """Get embedding for a text string using SentenceTransformers."""
-    embedding = model.encode([text])
-    return embedding[0].tolist()
+    return list(_embed_cached(_normalize_query(text)))
 
-def get_vector_context(query_text: str, top_k=TOP_K):
-    """Query Pinecone index using embedding."""
-    vec = embed_text(query_text)
+@lru_cache(maxsize=CACHE_SIZE)
+def _cached_vector_query(text_key: str, top_k: int):
+    """Query Pinecone for a normalized query, caching the matches.
+
+    Errors propagate uncached (lru_cache never stores a raising call);
+    the local-index fallback lives in get_vector_context so degraded
+    results are never memoized past the outage."""
+    vec = list(_embed_cached(text_key))
     res = index.query(
         vector=vec,
         top_k=top_k,
         include_metadata=True,
         include_values=False
     )
-    print(f"DEBUG: Pinecone returned {len(res['matches'])} results")
     return res["matches"]
 
+def get_vector_context(query_text: str, top_k=TOP_K):
+    """Query Pinecone index using embedding (cached for repeated queries)."""
+    key = _normalize_query(query_text)
+    try:
+        matches = _cached_vector_query(key, top_k)
+    except Exception as e:
+        if local_index is None:
+            raise
+        # Served fresh on every call while Pinecone is down, so the next
+        # request retries Pinecone instead of replaying cached fallbacks.
+        print(f"DEBUG: Pinecone query failed ({e}), using local HNSW index")
+        matches = local_index.query(list(_embed_cached(key)), top_k)
+    print(f"DEBUG: Pinecone returned {len(matches)} results")
+    return matches
+
+# Pool for fanning out multiple Pinecone queries concurrently
+_query_pool = ThreadPoolExecutor(max_workers=8)
+
+def get_vector_context_batch(queries: List[str], top_k=TOP_K):
+    """Run several Pinecone queries in one pass.
+
+    Embeds all queries with a single batched model.encode call (one forward
+    over the stacked texts instead of N), then fires the Pinecone lookups
+    concurrently since the API has no native multi-query endpoint. Returns
+    one list of matches per query, in input order.
+    """
+    if not queries:
+        return []
+
+    keys = [_normalize_query(q) for q in queries]
+    embeddings = model.encode(keys, batch_size=16)
+
+    def _query(vec):
+        res = index.query(
+            vector=vec.tolist(),
+            top_k=top_k,
+            include_metadata=True,
+            include_values=False
+        )
+        return res["matches"]
+
+    return list(_query_pool.map(_query, embeddings))
+
 def get_graph_context(query_text: str):
-    """Fetch graph context from Neo4j based on query."""
-    facts = []
-    
+    """Fetch graph context from Neo4j based on query (cached for repeated queries)."""
     if not NEO4J_AVAILABLE or not driver:
         print("DEBUG: Neo4j not available, skipping graph search")
-        return facts
-    
+        return []
+
     try:
-        with driver.session() as session:
-            # Search for nodes containing query terms
-            q = (
-                "MATCH (n:Entity)-[r]-(m:Entity) "
-                "WHERE toLower(n.name) CONTAINS toLower($query) "
-                "OR toLower(n.description) CONTAINS toLower($query) "
-                "OR any(tag IN n.tags WHERE toLower(tag) CONTAINS toLower($query)) "
-                "RETURN n.id AS source_id, n.name AS source_name, "
-                "type(r) AS rel, m.id AS target_id, m.name AS target_name, "
-                "m.description AS target_desc "
-                "LIMIT 10"
-            )
-            recs = session.run(q, query=query_text)
-            for r in recs:
-                facts.append({
-                    "source_id": r["source_id"],
-                    "source_name": r["source_name"],
-                    "rel": r["rel"],
-                    "target_id": r["target_id"],
-                    "target_name": r["target_name"],
-                    "target_desc": (r["target_desc"] or "")[:200]
-                })
+        facts = _cached_graph_query(_normalize_query(query_text))
     except Exception as e:
         print(f"DEBUG: Graph query failed: {e}")
-    
+        return []
     print(f"DEBUG: Graph returned {len(facts)} facts")
     return facts
 
-def build_prompt(user_query, vector_context, graph_context):
-    """Build a chat prompt combining vector DB matches and graph facts."""
-    system_prompt = """You are an expert Vietnam travel assistant. You have access to a comprehensive database of Vietnam travel information including destinations, activities, hotels, and attractions.
+# Graph search via the Lucene full-text index created by load_to_neo4j.py;
+# sublinear lookup instead of scanning every Entity per request
+_GRAPH_FULLTEXT_QUERY = (
+    "CALL db.index.fulltext.queryNodes('entity_text', $query) "
+    "YIELD node AS n, score "
+    "MATCH (n)-[r]-(m:Entity) "
+    "RETURN n.id AS source_id, n.name AS source_name, "
+    "type(r) AS rel, m.id AS target_id, m.name AS target_name, "
+    "m.description AS target_desc "
+    "LIMIT 10"
+)
+
+# Fallback CONTAINS scan for databases loaded before the index existed
+_GRAPH_SCAN_QUERY = (
+    "MATCH (n:Entity)-[r]-(m:Entity) "
+    "WHERE toLower(n.name) CONTAINS toLower($query) "
+    "OR toLower(n.description) CONTAINS toLower($query) "
+    "OR any(tag IN n.tags WHERE toLower(tag) CONTAINS toLower($query)) "
+    "RETURN n.id AS source_id, n.name AS source_name, "
+    "type(r) AS rel, m.id AS target_id, m.name AS target_name, "
+    "m.description AS target_desc "
+    "LIMIT 10"
+)
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _cached_graph_query(query_text: str):
+    """Run the Neo4j context query for a normalized query, caching the facts.
+
+    Connection errors propagate uncached (lru_cache never stores a call
+    that raises), so a transient outage is retried on the next request
+    instead of pinning an empty result for the life of the process.
+    """
+    facts = []
+    with driver.session() as session:
+        try:
+            recs = list(session.run(_GRAPH_FULLTEXT_QUERY, query=query_text))
+        except Exception as e:
+            print(f"DEBUG: Full-text search unavailable ({e}), using CONTAINS scan")
+            recs = list(session.run(_GRAPH_SCAN_QUERY, query=query_text))
+        for r in recs:
+            facts.append({
+                "source_id": r["source_id"],
+                "source_name": r["source_name"],
+                "rel": r["rel"],
+                "target_id": r["target_id"],
+                "target_name": r["target_name"],
+                "target_desc": (r["target_desc"] or "")[:200]
+            })
+
+    return facts
+
+# Static prompt scaffolding, built once at import instead of per request
+_SYS_PROMPT = """You are an expert Vietnam travel assistant. You have access to a comprehensive database of Vietnam travel information including destinations, activities, hotels, and attractions.
 
 IMPORTANT: Use the provided search results to give specific, detailed, and accurate answers. Always reference the actual places, activities, and information from the search results.
 
@@ -362,73 +671,79 @@ Your responses should be:
 
 If the user asks about specific topics like zoos, museums, restaurants, or activities, use the search results to provide detailed information about those specific places."""
 
-    # Format vector context with full details
-    vec_info = []
-    detailed_info = []
-    
+_CTX_TMPL = string.Template("""
+SEARCH RESULTS FOR: "$query"
+
+=== DETAILED INFORMATION ===
+$details
+
+=== SUMMARY ===
+$summary
+
+=== RELATIONSHIPS ===
+$rels
+""")
+
+_USER_TMPL = string.Template("""
+$context
+
+USER QUESTION: $query
+
+Please provide a comprehensive answer using the search results above. Include specific names, locations, and details from the database. If asking about specific types of places (like zoos, museums, restaurants), list them with details from the search results.
+""")
+
+def build_prompt(user_query, vector_context, graph_context):
+    """Build a chat prompt combining vector DB matches and graph facts."""
+    # Format vector context in a single pass: each metadata field is looked
+    # up once and feeds both the detailed and summary views. Lists are
+    # pre-sized and assigned by index to avoid growth reallocations.
+    n = len(vector_context)
+    detailed_info = [None] * n
+    vec_info = [None] * n
+
     for i, match in enumerate(vector_context):
         meta = match["metadata"]
         score = match.get("score", 0)
-        
+
         name = meta.get('name', 'Unknown')
         place_type = meta.get('type', 'Unknown')
         city = meta.get('city', meta.get('region', ''))
         tags = meta.get('tags', [])
-        
-        # Get the full text content if available
-        full_text = meta.get('description', '')
-        if not full_text and 'text' in meta:
-            full_text = meta['text']
-        
-        # Create detailed entry
-        detail_entry = f"""
-{i+1}. {name} ({place_type})
-   Location: {city}
-   Tags: {', '.join(tags) if tags else 'N/A'}
-   Description: {full_text[:300] if full_text else 'No description available'}
-   Relevance Score: {score:.3f}
-"""
-        detailed_info.append(detail_entry)
-        
-        # Create summary entry
+        full_text = meta.get('description', '') or meta.get('text', '')
+
+        detailed_info[i] = (
+            f"\n{i+1}. {name} ({place_type})\n"
+            f"   Location: {city}\n"
+            f"   Tags: {', '.join(tags) if tags else 'N/A'}\n"
+            f"   Description: {full_text[:300] if full_text else 'No description available'}\n"
+            f"   Relevance Score: {score:.3f}\n"
+        )
+
         summary = f"• {name} ({place_type})"
         if city:
             summary += f" in {city}"
         if tags:
             summary += f" - {', '.join(tags[:3])}"
-        vec_info.append(summary)
+        vec_info[i] = summary
 
     # Format graph context
-    graph_info = []
-    for fact in graph_context:
-        relation = f"• {fact['source_name']} → {fact['rel']} → {fact['target_name']}"
-        if fact['target_desc']:
-            relation += f": {fact['target_desc'][:100]}..."
-        graph_info.append(relation)
+    graph_info = [
+        f"• {fact['source_name']} → {fact['rel']} → {fact['target_name']}"
+        + (f": {fact['target_desc'][:100]}..." if fact['target_desc'] else "")
+        for fact in graph_context
+    ]
 
     # Create comprehensive context
-    search_context = f"""
-SEARCH RESULTS FOR: "{user_query}"
-
-=== DETAILED INFORMATION ===
-{''.join(detailed_info) if detailed_info else "No specific matches found in database"}
-
-=== SUMMARY ===
-{chr(10).join(vec_info[:8]) if vec_info else "No relevant matches found"}
-
-=== RELATIONSHIPS ===
-{chr(10).join(graph_info[:10]) if graph_info else "No relationships found"}
-"""
+    search_context = _CTX_TMPL.substitute(
+        query=user_query,
+        details=''.join(detailed_info) if detailed_info else "No specific matches found in database",
+        summary='\n'.join(vec_info[:8]) if vec_info else "No relevant matches found",
+        rels='\n'.join(graph_info[:10]) if graph_info else "No relationships found"
+    )
 
     prompt = [
-        {"role": "system", "content": system_prompt},
-        {"role": "user", "content": f"""
-{search_context}
-
-USER QUESTION: {user_query}
-
-Please provide a comprehensive answer using the search results above. Include specific names, locations, and details from the database. If asking about specific types of places (like zoos, museums, restaurants), list them with details from the search results.
-"""}
+        {"role": "system", "content": _SYS_PROMPT},
+        {"role": "user", "content": _USER_TMPL.substitute(context=search_context, query=user_query)}
     ]
     return prompt
 
@@ -455,7 +770,7 @@ def interactive_chat():
         
         # Build prompt and get response from DeepSeek
         prompt = build_prompt(query, vector_matches, graph_facts)
-        answer = deepseek_chat(prompt)
+        answer = deepseek_chat(prompt, fallback_ctx=(query, vector_matches, graph_facts))
         
         print("\n💬 Response:\n")
         print(answer)
@@ -1,75 +1,114 @@
 # load_to_neo4j.py
-import json
-from neo4j import GraphDatabase
+import asyncio
+from neo4j import AsyncGraphDatabase
 from tqdm import tqdm
 import config
+from dataset_utils import iter_dataset
 
 DATA_FILE = "vietnam_travel_dataset.json"
+BATCH_SIZE = 500       # nodes/relationships per round-trip
+MAX_IN_FLIGHT = 4      # concurrent write batches, stays under bolt's connection limit
 
-# Connect to Neo4j (handle empty password)
-try:
+def get_driver():
+    # Connect to Neo4j (handle empty password)
     if config.NEO4J_PASSWORD:
-        driver = GraphDatabase.driver(config.NEO4J_URI, auth=(config.NEO4J_USER, config.NEO4J_PASSWORD))
-    else:
-        driver = GraphDatabase.driver(config.NEO4J_URI)
-    
-    # Test connection
-    with driver.session() as session:
-        session.run("RETURN 1")
-    print("✅ Neo4j connected successfully")
-except Exception as e:
-    print(f"❌ Neo4j connection failed: {e}")
-    print("Please ensure Neo4j is running and accessible")
-    exit(1)
+        return AsyncGraphDatabase.driver(config.NEO4J_URI, auth=(config.NEO4J_USER, config.NEO4J_PASSWORD))
+    return AsyncGraphDatabase.driver(config.NEO4J_URI)
 
-def create_constraints(tx):
+async def create_constraints(tx):
     # generic uniqueness constraint on id for node label Entity (we also add label specific types)
-    tx.run("CREATE CONSTRAINT IF NOT EXISTS FOR (n:Entity) REQUIRE n.id IS UNIQUE")
+    await tx.run("CREATE CONSTRAINT IF NOT EXISTS FOR (n:Entity) REQUIRE n.id IS UNIQUE")
+    # full-text index so hybrid_chat can search name/description/tags via
+    # Lucene instead of a CONTAINS scan over every Entity
+    await tx.run(
+        "CREATE FULLTEXT INDEX entity_text IF NOT EXISTS "
+        "FOR (n:Entity) ON EACH [n.name, n.description, n.tags]"
+    )
 
-def upsert_node(tx, node):
-    # use label from node['type'] and always add :Entity label
-    labels = [node.get("type","Unknown"), "Entity"]
-    label_cypher = ":" + ":".join(labels)
-    # keep a subset of properties to store (avoid storing huge nested objects)
-    props = {k:v for k,v in node.items() if k not in ("connections",)}
-    # set properties using parameters
-    tx.run(
-        f"MERGE (n{label_cypher} {{id: $id}}) "
-        "SET n += $props",
-        id=node["id"], props=props
+async def upsert_node_batch(tx, label, rows):
+    # one UNWIND per batch instead of one round-trip per node; all rows in a
+    # batch share the same type label so the MERGE pattern stays static
+    await tx.run(
+        f"UNWIND $rows AS row "
+        f"MERGE (n:`{label}`:Entity {{id: row.id}}) "
+        "SET n += row.props",
+        rows=rows
     )
 
-def create_relationship(tx, source_id, rel):
-    # rel is like {"relation": "Located_In", "target": "city_hanoi"}
-    rel_type = rel.get("relation", "RELATED_TO")
-    target_id = rel.get("target")
-    if not target_id:
-        return
-    # Create relationship if both nodes exist
-    cypher = (
-        "MATCH (a:Entity {id: $source_id}), (b:Entity {id: $target_id}) "
-        f"MERGE (a)-[r:{rel_type}]->(b) "
-        "RETURN r"
+async def create_relationship_batch(tx, rel_type, rows):
+    # rows are like [{"src": "attraction_x", "dst": "city_hanoi"}, ...],
+    # grouped by relation type to keep typed relationships
+    await tx.run(
+        "UNWIND $rows AS row "
+        "MATCH (a:Entity {id: row.src}), (b:Entity {id: row.dst}) "
+        f"MERGE (a)-[r:`{rel_type}`]->(b)",
+        rows=rows
     )
-    tx.run(cypher, source_id=source_id, target_id=target_id)
 
-def main():
-    with open(DATA_FILE, "r", encoding="utf-8") as f:
-        nodes = json.load(f)
+async def main():
+    driver = get_driver()
+
+    # Test connection
+    try:
+        async with driver.session() as session:
+            await session.run("RETURN 1")
+        print("✅ Neo4j connected successfully")
+    except Exception as e:
+        print(f"❌ Neo4j connection failed: {e}")
+        print("Please ensure Neo4j is running and accessible")
+        await driver.close()
+        exit(1)
+
+    # Keep a few write batches in flight at once so Bolt serialization,
+    # network, and server-side execution overlap. Each batch needs its own
+    # session because a session runs one transaction at a time.
+    sem = asyncio.Semaphore(MAX_IN_FLIGHT)
+
+    async def write_batch(work, *args):
+        async with sem:
+            async with driver.session() as session:
+                await session.execute_write(work, *args)
+
+    async with driver.session() as session:
+        await session.execute_write(create_constraints)
 
-    with driver.session() as session:
-        session.execute_write(create_constraints)
-        # Upsert all nodes
-        for node in tqdm(nodes, desc="Creating nodes"):
-            session.execute_write(upsert_node, node)
+    # Pass 1: nodes. Stream the dataset, buffer rows per type label and
+    # flush full buffers as pipelined batch writes.
+    tasks = []
+    buffers = {}
+    for node in tqdm(iter_dataset(DATA_FILE), desc="Creating nodes"):
+        label = node.get("type", "Unknown")
+        rows = buffers.setdefault(label, [])
+        rows.append({
+            "id": node["id"],
+            "props": {k: v for k, v in node.items() if k not in ("connections",)}
+        })
+        if len(rows) >= BATCH_SIZE:
+            tasks.append(asyncio.create_task(write_batch(upsert_node_batch, label, buffers.pop(label))))
+    for label, rows in buffers.items():
+        tasks.append(asyncio.create_task(write_batch(upsert_node_batch, label, rows)))
+    await asyncio.gather(*tasks)
 
-        # Create relationships
-        for node in tqdm(nodes, desc="Creating relationships"):
-            conns = node.get("connections", [])
-            for rel in conns:
-                session.execute_write(create_relationship, node["id"], rel)
+    # Pass 2: relationships, once all endpoints exist. Re-streaming the
+    # file is cheaper than holding every edge in memory.
+    tasks = []
+    buffers = {}
+    for node in tqdm(iter_dataset(DATA_FILE), desc="Creating relationships"):
+        for rel in node.get("connections", []):
+            target_id = rel.get("target")
+            if not target_id:
+                continue
+            rel_type = rel.get("relation", "RELATED_TO")
+            rows = buffers.setdefault(rel_type, [])
+            rows.append({"src": node["id"], "dst": target_id})
+            if len(rows) >= BATCH_SIZE:
+                tasks.append(asyncio.create_task(write_batch(create_relationship_batch, rel_type, buffers.pop(rel_type))))
+    for rel_type, rows in buffers.items():
+        tasks.append(asyncio.create_task(write_batch(create_relationship_batch, rel_type, rows)))
+    await asyncio.gather(*tasks)
 
+    await driver.close()
     print("Done loading into Neo4j.")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
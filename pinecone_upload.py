@@ -53,8 +53,11 @@ index = pc.Index(INDEX_NAME)
 # Helper functions
 # -----------------------------
 def get_embeddings(texts):
-    """Generate embeddings using SentenceTransformers."""
-    embeddings = model.encode(texts)
+    """Generate L2-normalized embeddings using SentenceTransformers.
+
+    Unit-length vectors let Pinecone treat cosine as a plain dot product
+    and quantize more effectively."""
+    embeddings = model.encode(texts, batch_size=BATCH_SIZE, normalize_embeddings=True)
     return embeddings.tolist()
 
 def chunked(iterable, n):
@@ -73,17 +76,21 @@ def main():
         semantic_text = node.get("semantic_text") or (node.get("description") or "")[:1000]
         if not semantic_text.strip():
             continue
+        # keep metadata to the fields the chat layer actually reads, with the
+        # description trimmed so each query result stays small on the wire
         meta = {
             "id": node.get("id"),
             "type": node.get("type"),
             "name": node.get("name"),
             "city": node.get("city", node.get("region", "")),
-            "tags": node.get("tags", [])
+            "tags": node.get("tags", []),
+            "description": (node.get("description") or "")[:500]
         }
         items.append((node["id"], semantic_text, meta))
 
     print(f"Preparing to upsert {len(items)} items to Pinecone...")
 
+    local_vectors = []
     for batch in tqdm(list(chunked(items, BATCH_SIZE)), desc="Uploading batches"):
         ids = [item[0] for item in batch]
         texts = [item[1] for item in batch]
@@ -97,8 +104,15 @@ def main():
         ]
 
         index.upsert(vectors)
+        local_vectors.extend(vectors)
         time.sleep(0.2)
 
+    # Persist a local copy of the vectors so hybrid_chat's HNSW fallback
+    # index has data to serve when Pinecone is unreachable
+    with open(config.LOCAL_VECTOR_FILE, "w", encoding="utf-8") as f:
+        json.dump(local_vectors, f)
+    print(f"Saved {len(local_vectors)} vectors to {config.LOCAL_VECTOR_FILE} for local fallback.")
+
     print("All items uploaded successfully.")
 
 # -----------------------------
@@ -162,19 +162,18 @@ class TravelAssistant {
         this.showLoading();
         
         try {
-            const response = await fetch('/api/chat', {
+            const response = await fetch('/api/chat/stream', {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json',
                 },
                 body: JSON.stringify({ message })
             });
-            
-            const data = await response.json();
-            
+
             if (response.ok) {
-                this.addAssistantMessage(data.response, data.sources);
+                await this.readStreamedResponse(response);
             } else {
+                const data = await response.json();
                 this.addErrorMessage(data.error || 'Something went wrong. Please try again.');
             }
         } catch (error) {
@@ -185,6 +184,75 @@ class TravelAssistant {
             this.messageInput.focus();
         }
     }
+
+    async readStreamedResponse(response) {
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let fullText = '';
+        let messageDiv = null;
+
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+
+            // SSE frames are "data: {...}" lines separated by a blank line
+            const events = buffer.split('\n\n');
+            buffer = events.pop();
+
+            for (const event of events) {
+                if (!event.startsWith('data: ')) continue;
+
+                let payload;
+                try {
+                    payload = JSON.parse(event.slice(6));
+                } catch (error) {
+                    continue;
+                }
+
+                if (payload.delta) {
+                    if (!messageDiv) {
+                        // First token arrived - swap the spinner for a live message
+                        this.hideLoading();
+                        messageDiv = this.createStreamingMessage();
+                    }
+                    fullText += payload.delta;
+                    messageDiv.querySelector('.message-text').innerHTML = this.formatMessage(fullText);
+                    this.scrollToBottom();
+                }
+
+                if (payload.done && messageDiv) {
+                    // Re-render through the normal path so source badges appear
+                    messageDiv.remove();
+                    this.addAssistantMessage(fullText, payload.sources, false);
+                }
+            }
+        }
+
+        if (!messageDiv) {
+            this.addErrorMessage('Something went wrong. Please try again.');
+        }
+    }
+
+    createStreamingMessage() {
+        const messageDiv = document.createElement('div');
+        messageDiv.className = 'message message-assistant animate';
+
+        messageDiv.innerHTML = `
+            <div class="message-content">
+                <div class="message-text"></div>
+                <div class="message-meta">
+                    <i class="fas fa-robot"></i>
+                    <span>${this.formatTime(new Date())}</span>
+                </div>
+            </div>
+        `;
+
+        this.chatMessages.appendChild(messageDiv);
+        this.scrollToBottom();
+        return messageDiv;
+    }
     
     addUserMessage(message, animate = true) {
         const messageDiv = document.createElement('div');
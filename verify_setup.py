@@ -2,97 +2,365 @@
 """
 Quick setup verification for Hybrid AI Travel Assistant
 """
+import asyncio
+import hashlib
+import importlib.metadata
+import io
+import json
 import os
-from dotenv import load_dotenv
+import pathlib
+import sys
+import time
+from functools import lru_cache
 
-def check_env_file():
+# Prebuilt status prefixes: one allocation at import instead of fresh
+# f-string formatting at every report site
+OK = "\u2705 "
+FAIL = "\u274c "
+WARN = "\u26a0\ufe0f  "
+
+# Cache a successful verification on disk so re-runs skip the model load
+# when nothing relevant has changed
+CACHE_FILE = pathlib.Path.home() / ".cache" / "hybrid-ai" / "verify.json"
+CACHE_MAX_AGE = 24 * 3600  # re-verify at least daily
+
+@lru_cache(maxsize=1)
+def _env_stat():
+    """Stat .env once per run; the fingerprint and the env check share the result."""
+    try:
+        return os.stat('.env')
+    except OSError:
+        return None
+
+def _fingerprint():
+    """Hash .env contents plus key package versions; any change invalidates the cache."""
+    digest = hashlib.sha256()
+    st = _env_stat()
+    try:
+        if st is not None:
+            with open('.env', 'rb') as f:
+                if hasattr(hashlib, "file_digest"):  # 3.11+: hashes in place, no full copy
+                    digest = hashlib.file_digest(f, 'sha256')
+                else:
+                    for chunk in iter(lambda: f.read(65536), b""):
+                        digest.update(chunk)
+            # Fold the mtime into the key so a touched-but-identical .env still
+            # forces a re-check (editors rewrite files; intent beats content)
+            digest.update(str(st.st_mtime_ns).encode())
+    except FileNotFoundError:
+        pass
+
+    for dist in ("sentence-transformers", "pinecone-client", "pinecone"):
+        try:
+            digest.update(b"\0" + importlib.metadata.version(dist).encode())
+        except importlib.metadata.PackageNotFoundError:
+            pass
+
+    return digest.hexdigest()
+
+def _read_cached_result():
+    try:
+        with open(CACHE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _write_cached_result(key):
+    try:
+        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(CACHE_FILE, "w", encoding="utf-8") as f:
+            json.dump({"key": key, "ts": time.time()}, f)
+    except OSError:
+        pass  # caching is best-effort
+
+@lru_cache(maxsize=1)
+def _get_model():
+    """Load the embedding model once and reuse it across checks/runs."""
+    from sentence_transformers import SentenceTransformer
+
+    model_path = "all-MiniLM-L6-v2"
+    try:
+        # Pre-fetch the snapshot with parallel file downloads instead of the
+        # sequential fetch SentenceTransformer would do itself; hf_transfer
+        # (when installed) adds parallel range requests on top.
+        try:
+            import hf_transfer  # noqa: F401
+            os.environ.setdefault("HF_HUB_ENABLE_HF_TRANSFER", "1")
+        except ImportError:
+            pass
+        from huggingface_hub import snapshot_download
+        model_path = snapshot_download(
+            "sentence-transformers/all-MiniLM-L6-v2",
+            max_workers=8,
+            allow_patterns=['*.json', '*.txt', 'pytorch_model.bin', 'tokenizer*']
+        )
+    except Exception:
+        pass  # fall back to letting SentenceTransformer download sequentially
+
+    try:
+        # Newer sentence-transformers forwards model_kwargs to
+        # AutoModel.from_pretrained; low_cpu_mem_usage loads the state dict
+        # through memory-mapped tensors, so only the weight pages encode()
+        # actually touches become resident instead of the full checkpoint.
+        return SentenceTransformer(
+            model_path,
+            cache_folder=os.environ.get("ST_CACHE"),
+            model_kwargs={"low_cpu_mem_usage": True}
+        )
+    except TypeError:
+        # older sentence-transformers without model_kwargs support
+        return SentenceTransformer(model_path, cache_folder=os.environ.get("ST_CACHE"))
+
+# Built once at import; the check below resolves present/missing with
+# set arithmetic instead of growing a list key by key
+REQUIRED_ENV_KEYS = frozenset({'DEEPSEEK_API_KEY', 'PINECONE_API_KEY'})
+
+def check_env_file(out=sys.stdout):
     """Check if .env file exists and has required keys."""
-    if not os.path.exists('.env'):
-        print("❌ .env file not found")
+    # Reuse the stat _fingerprint already took for its mtime - one
+    # syscall answers both, instead of a fresh exists() probe here.
+    if _env_stat() is None:
+        print(FAIL + ".env file not found", file=out)
         return False
-    
-    load_dotenv()
-    
-    required_keys = ['DEEPSEEK_API_KEY', 'PINECONE_API_KEY']
-    missing_keys = []
-    
-    for key in required_keys:
-        value = os.getenv(key)
-        if not value:
-            missing_keys.append(key)
-        else:
-            print(f"✅ {key} found")
-    
-    if missing_keys:
-        print(f"❌ Missing keys in .env: {missing_keys}")
+
+    # Imported lazily so importing this module (e.g. from a test) stays
+    # instantaneous; heavy imports live behind the checks that need them,
+    # like SentenceTransformer behind _get_model.
+    from dotenv import load_dotenv
+    # Explicit path skips dotenv's upward directory walk; override=False
+    # leaves already-exported variables alone, and interpolate=False turns
+    # off $VAR expansion the API-token values never need.
+    load_dotenv('.env', override=False, interpolate=False)
+
+    env = os.environ.copy()  # plain dict: O(1) lookups instead of the environ proxy
+    present = frozenset(k for k in REQUIRED_ENV_KEYS if env.get(k))
+    missing = REQUIRED_ENV_KEYS - present
+
+    for key in sorted(present):
+        print(OK + key + " found", file=out)
+
+    if missing:
+        print(FAIL + "Missing keys in .env: " + str(sorted(missing)), file=out)
         return False
-    
+
     return True
 
-def test_imports():
-    """Test if required packages are installed."""
+# (display name, accepted distribution names) for the presence probe;
+# pinecone has shipped under two distribution names over time
+REQUIRED_PACKAGES = (
+    ("sentence-transformers", frozenset({"sentence-transformers"})),
+    ("pinecone", frozenset({"pinecone", "pinecone-client"})),
+    ("requests", frozenset({"requests"})),
+)
+
+def test_imports(out=sys.stdout):
+    """Check that required packages are installed.
+
+    Enumerates installed distributions once via importlib.metadata and
+    membership-checks all required packages against that single scan -
+    no import machinery runs at all, and the heavy imports stay confined
+    to test_embedding_model, which genuinely needs them.
+    """
+    installed = {
+        (dist.metadata['Name'] or '').lower().replace('_', '-')
+        for dist in importlib.metadata.distributions()
+    }
+
+    all_found = True
+    for display, names in REQUIRED_PACKAGES:
+        if installed & names:
+            print(OK + display + " installed", file=out)
+        else:
+            print(FAIL + display + " not installed", file=out)
+            all_found = False
+
+    # Warn when the multi-GB CUDA torch wheel sits on a host without an
+    # NVIDIA driver - the CPU wheel is an order of magnitude smaller and
+    # imports faster. Wheel flavor comes from the version metadata
+    # ("+cpu"/"+cuXXX" local segment), so torch itself is never imported.
+    # Linux-only: macOS wheels are CPU-only but carry no "+cpu" segment.
     try:
-        from sentence_transformers import SentenceTransformer
-        print("✅ sentence-transformers imported")
-    except ImportError:
-        print("❌ sentence-transformers not installed")
-        return False
-    
+        torch_version = importlib.metadata.version("torch")
+    except importlib.metadata.PackageNotFoundError:
+        torch_version = None
+    if (sys.platform == "linux" and torch_version and "+cpu" not in torch_version
+            and not os.path.exists("/proc/driver/nvidia")):
+        print(WARN + "CUDA-enabled torch wheel on a host without an NVIDIA driver", file=out)
+        print("   For CPU-only setups: pip install torch --index-url https://download.pytorch.org/whl/cpu", file=out)
+
+    return all_found
+
+ONNX_MODEL_DIR = "onnx_mini"  # created by export_onnx.py
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+# Marker left behind by a successful model probe; while it matches, the
+# whole check reduces to a stat plus a tiny read
+MODEL_MARKER = CACHE_FILE.parent / "model_ok.json"
+
+def _read_model_marker():
     try:
-        from pinecone import Pinecone
-        print("✅ pinecone imported")
-    except ImportError:
-        print("❌ pinecone not installed")
-        return False
-    
+        with open(MODEL_MARKER, encoding="utf-8") as f:
+            marker = json.load(f)
+        if marker.get("model") == EMBEDDING_MODEL and marker.get("dim"):
+            return marker
+    except (OSError, ValueError):
+        pass
+    return None
+
+def _write_model_marker(dim):
     try:
-        import requests
-        print("✅ requests imported")
-    except ImportError:
-        print("❌ requests not installed")
-        return False
-    
-    return True
+        MODEL_MARKER.parent.mkdir(parents=True, exist_ok=True)
+        with open(MODEL_MARKER, "w", encoding="utf-8") as f:
+            json.dump({"model": EMBEDDING_MODEL, "dim": int(dim)}, f)
+    except OSError:
+        pass  # marker is best-effort
 
-def test_embedding_model():
+def test_embedding_model(out=sys.stdout):
     """Test if embedding model can be loaded."""
+    marker = _read_model_marker()
+    if marker:
+        print(OK + f"Embedding model (cached, dimension: {marker['dim']})", file=out)
+        return True
+
+    # Cheap path: when the int8 ONNX export exists, probe it with
+    # onnxruntime (~100ms, tens of MB) instead of pulling in the full
+    # torch stack just to learn the output dimension.
+    if os.path.isdir(ONNX_MODEL_DIR):
+        try:
+            import onnxruntime as ort
+            for name in ("model_quantized.onnx", "model.onnx"):
+                model_path = os.path.join(ONNX_MODEL_DIR, name)
+                if os.path.isfile(model_path):
+                    break
+            session = ort.InferenceSession(model_path, providers=['CPUExecutionProvider'])
+            dim = session.get_outputs()[0].shape[-1]
+            if not isinstance(dim, int):  # dynamic axis: read the model config instead
+                with open(os.path.join(ONNX_MODEL_DIR, "config.json"), encoding="utf-8") as f:
+                    dim = json.load(f)["hidden_size"]
+            print(OK + f"Embedding model verified via ONNX export (dimension: {dim})", file=out)
+            _write_model_marker(dim)
+            return True
+        except Exception as e:
+            print(WARN + f"ONNX probe failed ({e}), loading the full model...", file=out)
+
     try:
-        from sentence_transformers import SentenceTransformer
-        model = SentenceTransformer("all-MiniLM-L6-v2")
+        model = _get_model()
+
+        # The probe only needs the output dimension, so swap the Linear
+        # layers for int8 dynamically-quantized versions first - a quarter
+        # of the FP32 memory traffic per forward, and accuracy is
+        # irrelevant here. The quantized singleton stays verification-only;
+        # hybrid_chat loads its own production model.
+        try:
+            import torch
+            import torch.nn as nn
+            torch.quantization.quantize_dynamic(
+                model._modules['0'].auto_model, {nn.Linear}, dtype=torch.qint8, inplace=True
+            )
+        except Exception:
+            pass  # quantization is a fast-path nicety, not a requirement
+
         test_embedding = model.encode(["test"])
-        print(f"✅ Embedding model loaded (dimension: {len(test_embedding[0])})")
+
+        # Warm up with a realistic batch (longer texts, padding, batched
+        # attention kernels) so the first production query doesn't pay the
+        # lazy-init cost this probe would otherwise leave behind
+        model.encode(["warmup sentence " * 20] * 8, batch_size=8, convert_to_numpy=True)
+        try:
+            import torch
+            if torch.cuda.is_available():
+                torch.cuda.synchronize()
+        except ImportError:
+            pass
+
+        print(OK + f"Embedding model loaded (dimension: {len(test_embedding[0])})", file=out)
+        _write_model_marker(len(test_embedding[0]))
         return True
     except Exception as e:
-        print(f"❌ Embedding model failed: {e}")
+        print(FAIL + f"Embedding model failed: {e}", file=out)
         return False
 
-def main():
-    print("🔍 Verifying Hybrid AI Travel Assistant Setup")
-    print("=" * 50)
-    
-    checks = [
-        ("Environment file", check_env_file),
-        ("Package imports", test_imports),
-        ("Embedding model", test_embedding_model)
-    ]
-    
+def main(skip_model=False, skip_imports=False):
+    # Collect the whole report and emit it with one stdout write at the
+    # end - a single syscall instead of one per print, which matters when
+    # output goes over SSH or through a CI log shipper.
+    lines = ["🔍 Verifying Hybrid AI Travel Assistant Setup", "=" * 50]
+
+    # Short-circuit when a recent successful run matches the current
+    # .env/package fingerprint - nothing relevant has changed.
+    key = _fingerprint()
+    cached = _read_cached_result()
+    if cached and cached.get("key") == key and time.time() - cached.get("ts", 0) < CACHE_MAX_AGE:
+        lines.append("🎉 Setup verified recently and nothing has changed (cached result).")
+        lines.append(f"   Delete {CACHE_FILE} to force a full re-check.")
+        sys.stdout.write("\n".join(lines) + "\n")
+        return True
+
+    # CI images with the model already baked in only need the env
+    # assertions, so the heavier checks can be skipped via CLI flags
+    checks = [("Environment file", check_env_file)]
+    if not skip_imports:
+        checks.append(("Package imports", test_imports))
+    if not skip_model:
+        checks.append(("Embedding model", test_embedding_model))
+    checks = tuple(checks)
+
+    # Run the checks concurrently - the slow model load overlaps with the
+    # env/import probes, and future network probes (Pinecone/DeepSeek
+    # reachability) can join the same gather as native coroutines. Each
+    # check writes into its own buffer so output still prints
+    # deterministically in submission order.
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass  # stdlib event loop is fine
+
+    async def run_check(name, check_func):
+        buf = io.StringIO()
+        ok = await asyncio.to_thread(check_func, out=buf)
+        return name, ok, buf.getvalue()
+
+    async def run_all():
+        return await asyncio.gather(*(run_check(name, fn) for name, fn in checks))
+
+    results = asyncio.run(run_all())
+
     all_passed = True
-    for name, check_func in checks:
-        print(f"\n📋 Checking {name}...")
-        if not check_func():
+    for name, ok, output in results:
+        lines.append(f"\n📋 Checking {name}...")
+        lines.append(output.rstrip("\n"))
+        if not ok:
             all_passed = False
-    
-    print("\n" + "=" * 50)
+
+    lines.append("\n" + "=" * 50)
     if all_passed:
-        print("🎉 All checks passed! You're ready to go!")
-        print("\n📋 Next steps:")
-        print("1. Run: python pinecone_upload.py")
-        print("2. Run: python load_to_neo4j.py (optional)")
-        print("3. Run: python hybrid_chat.py")
+        # Only a full run may seed the cache - a --fast/--skip pass says
+        # nothing about the checks it skipped, and the next plain run must
+        # not short-circuit on it.
+        if not (skip_model or skip_imports):
+            _write_cached_result(key)
+        lines.append("🎉 All checks passed! You're ready to go!")
+        lines.append("\n📋 Next steps:")
+        lines.append("1. Run: python pinecone_upload.py")
+        lines.append("2. Run: python load_to_neo4j.py (optional)")
+        lines.append("3. Run: python hybrid_chat.py")
     else:
-        print("❌ Some checks failed. Please fix the issues above.")
-    
+        lines.append(FAIL + "Some checks failed. Please fix the issues above.")
+
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
     return all_passed
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    import argparse
+    parser = argparse.ArgumentParser(description="Verify Hybrid AI Travel Assistant setup")
+    parser.add_argument('--fast', action='store_true',
+                        help='environment check only (implies --skip-model --skip-imports)')
+    parser.add_argument('--skip-model', action='store_true',
+                        help='skip the embedding model probe')
+    parser.add_argument('--skip-imports', action='store_true',
+                        help='skip the package presence check')
+    args = parser.parse_args()
+    main(skip_model=args.fast or args.skip_model,
+         skip_imports=args.fast or args.skip_imports)
\ No newline at end of file